@@ -1,4 +1,9 @@
 import os
+import queue
+import shutil
+from fractions import Fraction
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 from PIL import Image
 
@@ -10,117 +15,263 @@ from tkinter import ttk
 
 # ------------ Core logic ------------
 
-def compute_canvas_sizes_no_resize(size, short_side, long_side):
+# Supported extensions and the PIL format each one is written as
+SAVE_FORMATS = {
+    ".jpg": "JPEG",
+    ".jpeg": "JPEG",
+    ".tif": "TIFF",
+    ".tiff": "TIFF",
+    ".png": "PNG",
+    ".webp": "WEBP",
+}
+IMAGE_EXTS = frozenset(SAVE_FORMATS)
+
+
+@lru_cache(maxsize=256)
+def compute_canvas_sizes_no_resize(w, h, short_side, long_side):
     """
-    Given image size (w, h) and target aspect ratio short:long (e.g. 2:3),
+    Given image width/height and target aspect ratio short:long (e.g. 2:3),
     returns the minimal canvas (W, H) that:
       - keeps the original image size unchanged
       - only adds padding
       - has aspect ratio long/short on the long side.
+    Takes plain hashable scalars so results can be memoised: batches from
+    one camera repeat the same few sizes.
     """
-    w, h = size
-    target_ratio = long_side / short_side
+    # Exact rational arithmetic: ratios compare by cross-multiplying and
+    # sizes round up with -(-a // b), so nothing drifts at integer edges
+    short_side = Fraction(short_side)
+    long_side = Fraction(long_side)
 
     if w >= h:
         # Landscape
-        current_ratio = w / h
-        if abs(current_ratio - target_ratio) < 1e-6:
+        if w * short_side == h * long_side:
             return w, h
-        elif current_ratio > target_ratio:
+        elif w * short_side > h * long_side:
             # too wide → increase height
-            new_h = int((w / target_ratio) + 0.9999)
+            new_h = -(-w * short_side // long_side)
             new_w = w
         else:
             # too tall → increase width
-            new_w = int((h * target_ratio) + 0.9999)
+            new_w = -(-h * long_side // short_side)
             new_h = h
     else:
         # Portrait
-        current_ratio = h / w
-        if abs(current_ratio - target_ratio) < 1e-6:
+        if h * short_side == w * long_side:
             return w, h
-        elif current_ratio > target_ratio:
+        elif h * short_side > w * long_side:
             # too tall → increase width
-            new_w = int((h / target_ratio) + 0.9999)
+            new_w = -(-h * short_side // long_side)
             new_h = h
         else:
             # too wide → increase height
-            new_h = int((w * target_ratio) + 0.9999)
+            new_h = -(-w * long_side // short_side)
             new_w = w
 
     return max(new_w, w), max(new_h, h)
 
 
 
-def process_image(
-    input_path,
-    output_path,
-    ratio_short,
-    ratio_long,
-    border_percent=0.0,
-    bg_color=(255, 255, 255),
-    preserve_extra_metadata=True,
-    even_mode=False, ):
+def compute_final_canvas(w, h, ratio_short, ratio_long, border_percent=0.0, even_mode=False):
     """
-    - Pads to desired aspect ratio without altering original image pixels,
-      unless even_mode=True.
-    - even_mode=True: no aspect padding, only optional outer border is added.
-    - Adds optional outer border (%).
-    - Always preserves ICC profile (for correct printing).
-    - EXIF and DPI are optional (checkbox).
+    Returns (W, H, offset_x, offset_y): the output size — aspect padding
+    (skipped in even_mode) followed by the optional outer border — and
+    where the w x h image is pasted so it ends up centred.
     """
-    img = Image.open(input_path)
-
-    exif = img.info.get("exif")
-    icc_profile = img.info.get("icc_profile")
-    dpi = img.info.get("dpi")
-
     # Step 1 — pad to aspect ratio or not (even_mode)
     if even_mode:
-        canvas_w, canvas_h = img.size
+        canvas_w, canvas_h = w, h
     else:
         canvas_w, canvas_h = compute_canvas_sizes_no_resize(
-            img.size, ratio_short, ratio_long
+            w, h, ratio_short, ratio_long
         )
 
-    mode = img.mode if img.mode in ("RGB", "RGBA", "L") else "RGB"
-    inner_canvas = Image.new(mode, (canvas_w, canvas_h), bg_color)
-
-    offset_x = (canvas_w - img.width) // 2
-    offset_y = (canvas_h - img.height) // 2
-    inner_canvas.paste(img, (offset_x, offset_y))
-
-    # Step 2 — optional outer border
-    final_canvas = inner_canvas
+    # Step 2 — optional outer border, applied to the padded size
+    final_w, final_h = canvas_w, canvas_h
     if border_percent and border_percent > 0:
         factor = 1 + border_percent
-        final_w = int(canvas_w * factor)
-        final_h = int(canvas_h * factor)
+        final_w, final_h = int(canvas_w * factor), int(canvas_h * factor)
+
+    return final_w, final_h, (final_w - w) // 2, (final_h - h) // 2
+
+
+def canvas_mode(img):
+    """
+    Mode the output is written in; anything else is converted to RGB.
+    """
+    return img.mode if img.mode in ("RGB", "RGBA", "L") else "RGB"
+
+
+def _fill_value(bg_color, mode):
+    """
+    Converts an RGB bg_color to the native pixel value of `mode`
+    (e.g. a single luma byte for "L"), using PIL's own conversion.
+    """
+    return Image.new("RGB", (1, 1), bg_color).convert(mode).getpixel((0, 0))
+
+
+def _new_padded_canvas(img, mode, size, offset, bg_color):
+    """
+    Builds a canvas of `size` with `img` pasted at `offset`.
+    Every pixel is written once: the image covers the centre and only the
+    four border strips around it are filled with bg_color.
+    """
+    fill = _fill_value(bg_color, mode)
+    canvas_w, canvas_h = size
+    left, top = offset
+    right, bottom = left + img.width, top + img.height
+
+    # Uninitialised buffer, instead of a full solid fill we'd overwrite anyway
+    canvas = Image.new(mode, size, None)
+    canvas.paste(img, offset)
+
+    strips = (
+        (0, 0, canvas_w, top),               # top
+        (0, bottom, canvas_w, canvas_h),     # bottom
+        (0, top, left, bottom),              # left
+        (right, top, canvas_w, bottom),      # right
+    )
+    for x0, y0, x1, y1 in strips:
+        if x1 > x0 and y1 > y0:
+            canvas.paste(fill, (x0, y0, x1, y1))
+
+    return canvas
+
+
+def pad_image(
+    img,
+    ratio_short,
+    ratio_long,
+    border_percent=0.0,
+    bg_color=(255, 255, 255),
+    even_mode=False, ):
+    """
+    Returns the padded (and optionally bordered) canvas for an already
+    decoded image. Pure pixel work, no I/O.
+    """
+    final_w, final_h, offset_x, offset_y = compute_final_canvas(
+        img.width, img.height, ratio_short, ratio_long, border_percent, even_mode
+    )
+    mode = canvas_mode(img)
+
+    # Already the right shape and no border → nothing to pad.
+    # Still hand back a plain copy with no info: PIL encoders fall back to
+    # the source's own metadata (TIFF tags, JPEG comment, PNG tRNS), and only
+    # _load_save_kwargs may decide what gets written.
+    if (final_w, final_h) == img.size:
+        out = img.convert(mode) if img.mode != mode else img.copy()
+        out.info = {}
+        return out
+
+    # Single canvas: the image goes straight to its final position
+    final_canvas = _new_padded_canvas(
+        img, mode, (final_w, final_h), (offset_x, offset_y), bg_color
+    )
 
-        final_canvas = Image.new(mode, (final_w, final_h), bg_color)
-        ox = (final_w - canvas_w) // 2
-        oy = (final_h - canvas_h) // 2
-        final_canvas.paste(inner_canvas, (ox, oy))
+    return final_canvas
 
-    # Prepare save kwargs
+
+def _load_save_kwargs(img, preserve_extra_metadata):
+    """
+    Picks the metadata to carry over from an opened image into a plain
+    dict of save kwargs (bytes and tuples only, no PIL objects).
+    """
     save_kwargs = {}
 
     # Always preserve ICC
+    icc_profile = img.info.get("icc_profile")
     if icc_profile:
         save_kwargs["icc_profile"] = icc_profile
 
     # Optional EXIF + DPI
     if preserve_extra_metadata:
+        exif = img.info.get("exif")
+        dpi = img.info.get("dpi")
         if exif:
             save_kwargs["exif"] = exif
         if dpi:
             save_kwargs["dpi"] = dpi
 
+    return save_kwargs
+
+
+def save_image(canvas, output_path, save_kwargs):
+    """
+    Encodes and writes the final canvas.
+    """
     ext = os.path.splitext(output_path)[1].lower()
-    if ext in (".jpg", ".jpeg", ".webp"):
-        save_kwargs["quality"] = 100
 
-    final_canvas.save(output_path, **save_kwargs)
+    # Print-ready but not wasteful: q95 (with full-resolution 4:4:4 chroma
+    # for JPEG) is visually indistinguishable from q100 in print, and
+    # encodes much faster into far smaller files.
+    if ext in (".jpg", ".jpeg"):
+        save_kwargs.update(quality=95, subsampling=0, optimize=False)
+    elif ext == ".webp":
+        save_kwargs["quality"] = 95
+
+    canvas.save(output_path, format=SAVE_FORMATS[ext], **save_kwargs)
+
+
+def process_image(
+    input_path,
+    output_path,
+    ratio_short,
+    ratio_long,
+    border_percent=0.0,
+    bg_color=(255, 255, 255),
+    preserve_extra_metadata=True,
+    even_mode=False, ):
+    """
+    - Pads to desired aspect ratio without altering original image pixels,
+      unless even_mode=True.
+    - even_mode=True: no aspect padding, only optional outer border is added.
+    - Adds optional outer border (%).
+    - Always preserves ICC profile (for correct printing).
+    - EXIF and DPI are optional (checkbox).
+    - Images that already fit, with EXIF + DPI kept, are copied byte-for-byte.
+
+    Runs as three stages (load → pad → save); in a batch, the worker pool
+    keeps the stages of different files overlapping.
+    """
+    # Lazy open: only the header is read until img.load()
+    img = Image.open(input_path)
+    in_ext = os.path.splitext(input_path)[1].lower()
+    out_ext = os.path.splitext(output_path)[1].lower()
+
+    unchanged = (
+        preserve_extra_metadata
+        and canvas_mode(img) == img.mode
+        and getattr(img, "n_frames", 1) == 1
+        and in_ext == out_ext
+        and compute_final_canvas(
+            img.width, img.height, ratio_short, ratio_long, border_percent, even_mode
+        )[:2] == img.size
+    )
+    if unchanged:
+        # Nothing to pad: a byte copy skips decode + re-encode, is lossless,
+        # and keeps all metadata by definition
+        img.close()
+        shutil.copyfile(input_path, output_path)
+        return
+
+    img.load()
+    save_kwargs = _load_save_kwargs(img, preserve_extra_metadata)
+
+    final_canvas = pad_image(
+        img,
+        ratio_short,
+        ratio_long,
+        border_percent=border_percent,
+        bg_color=bg_color,
+        even_mode=even_mode,
+    )
+
+    # pad_image always returns a new image, so the decoded source can be
+    # freed before encoding. Peak memory (source + canvas) is unchanged;
+    # only the encode step runs with the canvas alone.
+    img.close()
+
+    save_image(final_canvas, output_path, save_kwargs)
 
 
 # ------------ GUI ------------
@@ -156,11 +307,19 @@ class PadApp:
         self.overwrite_all = False
         self.skip_all = False
 
+        # Batch progress: executor threads push (fname, error) results here,
+        # the Tk main loop drains it in poll_progress
+        self.progress_q = queue.Queue()
+        self.jobs_total = 0
+        self.jobs_done = 0
+        self.processed_count = 0
+        self.executor = None
+
         # ----- Menu Bar -----
         menubar = tk.Menu(root)
 
         file_menu = tk.Menu(menubar, tearoff=0)
-        file_menu.add_command(label="Close", command=root.quit)
+        file_menu.add_command(label="Close", command=self.close)
         menubar.add_cascade(label="File", menu=file_menu)
 
         about_menu = tk.Menu(menubar, tearoff=0)
@@ -168,6 +327,7 @@ class PadApp:
         menubar.add_cascade(label="About", menu=about_menu)
 
         root.config(menu=menubar)
+        root.protocol("WM_DELETE_WINDOW", self.close)
         # ----- End Menu Bar -----
 
         # Use a main frame for padding
@@ -263,13 +423,19 @@ class PadApp:
         self.status_label = ttk.Label(bottom_frame, text="", foreground="blue")
         self.status_label.grid(row=0, column=0, sticky="w")
 
-        ttk.Button(bottom_frame, text="Run", command=self.run).grid(
-            row=0, column=1, sticky="e", padx=(10, 0)
-        )
+        self.run_button = ttk.Button(bottom_frame, text="Run", command=self.run)
+        self.run_button.grid(row=0, column=1, sticky="e", padx=(10, 0))
 
         # React to dropdown changes (enable/disable custom ratio)
         self.ratio_label_var.trace_add("write", self.on_ratio_change)
 
+    def close(self):
+        # Drop queued jobs, otherwise the interpreter's exit handler waits
+        # for the whole batch behind an already dead window
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        self.root.quit()
+
     def on_ratio_change(self, *args):
         label = self.ratio_label_var.get()
         if label == "Custom":
@@ -311,6 +477,35 @@ class PadApp:
         if choice is False:
             return False
 
+    def build_jobs(self, files, output_dir):
+        """
+        Returns the (fname, in_path, out_path) worklist for a run.
+        Overwrite prompts must stay on the main (Tk) thread, so they are all
+        answered here, before anything is handed to the workers.
+        """
+        # Pass 1 — output path for every input
+        targets = []
+        for entry in files:
+            name, ext = os.path.splitext(entry.name)
+            out_path = os.path.join(output_dir, f"{name}_padded{ext}")
+            targets.append((entry.name, entry.path, out_path))
+
+        # Pass 2 — resolve prompts for outputs that already exist
+        needs_prompt = [job for job in targets if os.path.exists(job[2])]
+        skipped = set()
+
+        for job in needs_prompt:
+            res = self.ask_overwrite(job[2])
+            if res is None:
+                # Cancel: only files before this one are processed
+                targets = targets[:targets.index(job)]
+                break
+            if res is False:
+                skipped.add(job[2])
+
+        # Pass 3 — final worklist
+        return [job for job in targets if job[2] not in skipped]
+
     def show_about(self):
         import webbrowser
 
@@ -386,7 +581,8 @@ class PadApp:
                 return
             try:
                 s, l = custom.split(":")
-                ratio_short, ratio_long = float(s), float(l)
+                # Fraction keeps decimal ratios like 1.5:2 exact
+                ratio_short, ratio_long = Fraction(s), Fraction(l)
             except:
                 messagebox.showerror("Error", "Invalid custom ratio. Use format e.g. 3:7")
                 return
@@ -394,47 +590,84 @@ class PadApp:
         else:
             ratio_short, ratio_long = self.ratio_options[label]
 
-        files = [
-            f for f in os.listdir(input_dir)
-            if f.lower().endswith((".jpg", ".jpeg", ".tif", ".tiff", ".png", ".webp"))
-        ]
+        # DirEntry carries cached type info, so no extra stat per file
+        with os.scandir(input_dir) as it:
+            files = [
+                entry for entry in it
+                if entry.is_file()
+                and os.path.splitext(entry.name)[1].lower() in IMAGE_EXTS
+            ]
 
         if not files:
             messagebox.showinfo("Info", "No images found.")
             return
 
-        self.status_label.config(text="Processing...")
-        self.root.update_idletasks()
+        jobs = self.build_jobs(files, output_dir)
 
-        count = 0
+        self.status_label.config(text="Processing...")
 
-        for fname in files:
-            in_path = os.path.join(input_dir, fname)
-            name, ext = os.path.splitext(fname)
-            out_path = os.path.join(output_dir, f"{name}_padded{ext}")
+        job_kwargs = dict(
+            ratio_short=ratio_short,
+            ratio_long=ratio_long,
+            border_percent=border_percent,
+            bg_color=self.border_color_rgb,
+            preserve_extra_metadata=preserve_extra_metadata,
+            even_mode=even_mode,
+        )
 
-            if os.path.exists(out_path):
-                res = self.ask_overwrite(out_path)
-                if res is None:
-                    break
-                if res is False:
-                    continue
+        try:
+            # Default worker count is os.cpu_count(), capped at 61 on Windows
+            self.executor = ProcessPoolExecutor()
+        except (NotImplementedError, OSError):
+            # No usable multiprocessing here; threads still help because PIL
+            # releases the GIL during decode/encode.
+            self.executor = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+        self.jobs_total = len(jobs)
+        self.jobs_done = 0
+        self.processed_count = 0
+
+        for fname, in_path, out_path in jobs:
+            future = self.executor.submit(process_image, in_path, out_path, **job_kwargs)
+            future.add_done_callback(partial(self.on_job_done, fname))
+
+        # Queued jobs keep running; the pool winds down once they are done
+        # (or is cancelled from close)
+        self.executor.shutdown(wait=False)
+
+        # Keep the UI responsive: progress is polled from the Tk main loop
+        self.run_button.config(state=tk.DISABLED)
+        self.root.after(100, self.poll_progress)
+
+    def on_job_done(self, fname, future):
+        # Called on an executor thread: hand the result over, never touch Tk here
+        if future.cancelled():
+            return
+        self.progress_q.put((fname, future.exception()))
 
+    def poll_progress(self):
+        while True:
             try:
-                process_image(
-                    in_path,
-                    out_path,
-                    ratio_short=ratio_short,
-                    ratio_long=ratio_long,
-                    border_percent=border_percent,
-                    bg_color=self.border_color_rgb,
-                    preserve_extra_metadata=preserve_extra_metadata,
-                    even_mode=even_mode,
-                )
-                count += 1
-            except Exception as e:
-                print(f"Error processing {fname}: {e}")
+                fname, error = self.progress_q.get_nowait()
+            except queue.Empty:
+                break
+
+            self.jobs_done += 1
+            if error is None:
+                self.processed_count += 1
+            else:
+                print(f"Error processing {fname}: {error}")
+
+        if self.jobs_done < self.jobs_total:
+            self.status_label.config(
+                text=f"Processed {self.jobs_done} / {self.jobs_total}"
+            )
+            self.root.after(100, self.poll_progress)
+            return
 
+        count = self.processed_count
+        self.executor = None
+        self.run_button.config(state=tk.NORMAL)
         self.status_label.config(text=f"Done! Processed {count} images.")
         messagebox.showinfo("Finished", f"Processed {count} images.")
 
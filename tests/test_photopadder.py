@@ -0,0 +1,44 @@
+import sys
+from pathlib import Path
+
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from photopadder import process_image  # noqa: E402
+
+
+def test_unpadded_tiff_drops_dpi_when_not_preserved(tmp_path):
+    src = tmp_path / "in.tif"
+    out = tmp_path / "out.tif"
+    # Already 2:3, so nothing gets padded
+    Image.new("RGB", (200, 300), (10, 20, 30)).save(src, dpi=(300, 300))
+
+    process_image(str(src), str(out), 2, 3, preserve_extra_metadata=False)
+
+    with Image.open(out) as padded:
+        assert padded.size == (200, 300)
+        assert padded.info.get("dpi") != (300, 300)
+
+
+def test_unpadded_jpeg_drops_comment_when_not_preserved(tmp_path):
+    src = tmp_path / "in.jpg"
+    out = tmp_path / "out.jpg"
+    Image.new("RGB", (200, 300), (10, 20, 30)).save(src, comment=b"secret")
+
+    process_image(str(src), str(out), 2, 3, preserve_extra_metadata=False)
+
+    with Image.open(out) as padded:
+        assert "comment" not in padded.info
+
+
+def test_unpadded_palette_png_writes_no_transparency(tmp_path):
+    src = tmp_path / "in.png"
+    out = tmp_path / "out.png"
+    Image.new("P", (200, 300), 0).save(src, transparency=0)
+
+    process_image(str(src), str(out), 2, 3)
+
+    with Image.open(out) as padded:
+        assert padded.mode == "RGB"
+        assert "transparency" not in padded.info